@@ -1,7 +1,96 @@
 import pandas as pd
 import numpy as np
+import warnings
 from typing import Dict, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:
+    import polars as pl
+except ImportError:  # Polars optionnel : repli sur NumPy
+    pl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # PyArrow optionnel : comptage des manquants via isna()
+    pc = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba optionnel : noyau fusionné désactivé
+    njit = None
+
+# Au-delà de ce nombre de cellules numériques, le noyau Numba (un seul parcours) est utilisé
+NUMBA_MIN_CELLS = 1_000_000
+# Polars seulement sur les tables hautes et étroites : le coût de planification croît avec
+# le nombre d'expressions (9 par colonne) et dépasse vite le gain (mesuré sur 1 cœur :
+# plus lent que NumPy à 50k x 20 ou 900 x 1000, plus rapide dès 1M lignes x <= 16 colonnes)
+POLARS_MIN_ROWS = 1_000_000
+POLARS_MAX_COLUMNS = 16
+REDUCTION_KEYS = ["mean", "std", "min", "max", "missing", "outliers", "max_z", "recent", "previous"]
+
+if njit is not None:
+    # fastmath sans "nnan"/"ninf" : les tests NaN (valeurs manquantes) doivent être conservés
+    @njit(parallel=True, cache=True, fastmath={"contract", "arcp", "nsz"})
+    def _fused_reductions(arr, threshold):
+        """Statistiques par colonne en un parcours (Welford), une ligne de sortie par clé de REDUCTION_KEYS."""
+        n, n_cols = arr.shape
+        out = np.full((9, n_cols), np.nan)
+        for j in prange(n_cols):
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            lo = np.inf
+            hi = -np.inf
+            for i in range(n):
+                x = np.float64(arr[i, j])
+                if np.isnan(x):
+                    continue
+                count += 1
+                delta = x - mean
+                mean += delta / count
+                m2 += delta * (x - mean)
+                lo = min(lo, x)
+                hi = max(hi, x)
+            out[4, j] = n - count
+            out[5, j] = 0
+            if count == 0:
+                continue
+            out[0, j] = mean
+            out[2, j] = lo
+            out[3, j] = hi
+            
+            # Z-scores : second parcours de la colonne, seulement si l'écart-type est défini
+            if count > 1:
+                std = np.sqrt(m2 / (count - 1))
+                out[1, j] = std
+                if std > 0:
+                    n_out = 0
+                    z_max = 0.0
+                    for i in range(n):
+                        x = np.float64(arr[i, j])
+                        if np.isnan(x):
+                            continue
+                        z = abs((x - mean) / std)
+                        if z > threshold:
+                            n_out += 1
+                        z_max = max(z_max, z)
+                    out[5, j] = n_out
+                    out[6, j] = z_max
+            
+            # Moyennes des 5 dernières lignes et des 5 précédentes (5 premières si moins de 10 lignes)
+            prev_start = n - 10 if n >= 10 else 0
+            for k, start, stop in ((7, max(n - 5, 0), n), (8, prev_start, min(prev_start + 5, n))):
+                total = 0.0
+                valid = 0
+                for i in range(start, stop):
+                    x = np.float64(arr[i, j])
+                    if not np.isnan(x):
+                        total += x
+                        valid += 1
+                if valid:
+                    out[k, j] = total / valid
+        return out
 
 @dataclass
 class AnalysisResult:
@@ -12,6 +101,10 @@ class AnalysisResult:
     anomalies_detected: List[Dict]
     recommendations: List[str]
     stats: Dict
+    # Statistiques mises en cache pour l'interface (évite de recalculer les Z-scores)
+    numeric_means: Dict[str, float] = field(default_factory=dict)
+    numeric_stds: Dict[str, float] = field(default_factory=dict)
+    anomaly_masks: Dict[str, np.ndarray] = field(default_factory=dict)
 
 class DataAnalyzer:
     def __init__(self):
@@ -23,18 +116,101 @@ class DataAnalyzer:
             "missing_warning": 20,    # 20% manquant = avertissement
         }
     
+    def _missing_counts(self, df: pd.DataFrame) -> np.ndarray:
+        """Valeurs manquantes par colonne (null ou NaN, comme `isna()` sur un bloc NumPy).
+        
+        Pour un DataFrame Arrow, le nombre de nulls est lu dans les métadonnées des bitmaps
+        (O(1) par colonne) ; seuls les NaN des colonnes flottantes demandent un parcours.
+        """
+        if pc is not None and df.shape[1] and all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes):
+            counts = []
+            for i in range(df.shape[1]):
+                column = df.iloc[:, i].array.__arrow_array__()
+                missing = column.null_count
+                if pa.types.is_floating(column.type):
+                    missing += pc.sum(pc.is_nan(column)).as_py() or 0
+                counts.append(missing)
+            return np.array(counts)
+        return df.isna().to_numpy().sum(axis=0)
+    
+    def _numpy_reductions(self, arr: np.ndarray) -> Dict[str, np.ndarray]:
+        """Statistiques par colonne d'un bloc numérique 2-D (NaN = manquant)."""
+        n, n_cols = arr.shape
+        with warnings.catch_warnings():
+            # Colonnes entièrement vides : NaN attendu, comme avec pandas
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(arr, axis=0)
+            stds = np.nanstd(arr, axis=0, ddof=1)
+            
+            # Z-scores de toutes les colonnes en une opération (écart-type nul -> NaN, jamais anomalie)
+            safe_std = np.where(stds > 0, stds, np.nan)
+            z = np.abs((arr - means) / safe_std)
+            
+            empty = np.full(n_cols, np.nan)
+            return {
+                "mean": means,
+                "std": stds,
+                "min": np.nanmin(arr, axis=0) if n else empty,
+                "max": np.nanmax(arr, axis=0) if n else empty,
+                "missing": np.isnan(arr).sum(axis=0),
+                "outliers": np.count_nonzero(z > self.thresholds["anomaly_zscore"], axis=0),
+                "max_z": np.nanmax(z, axis=0) if n else empty,
+                "recent": np.nanmean(arr[-5:], axis=0),
+                "previous": np.nanmean(arr[-10:-5] if n >= 10 else arr[:5], axis=0),
+            }
+    
+    def _numba_reductions(self, arr: np.ndarray) -> Dict[str, np.ndarray]:
+        """Mêmes statistiques que `_numpy_reductions`, via le noyau fusionné `_fused_reductions`."""
+        out = _fused_reductions(arr, float(self.thresholds["anomaly_zscore"]))
+        return dict(zip(REDUCTION_KEYS, out))
+    
+    def _polars_reductions(self, df: pd.DataFrame, numeric_cols: pd.Index) -> Dict[str, np.ndarray]:
+        """Mêmes statistiques que `_numpy_reductions`, en une seule requête Polars lazy."""
+        n = len(df)
+        # Noms positionnels : Polars exige des noms de colonnes texte et uniques
+        names = [str(i) for i in range(len(numeric_cols))]
+        lf = pl.from_pandas(df[numeric_cols].set_axis(names, axis=1)).lazy()
+        
+        exprs = []
+        for name in names:
+            col = pl.col(name).cast(pl.Float64).fill_nan(None)
+            std = col.std(ddof=1)
+            z = ((col - col.mean()) / pl.when(std > 0).then(std)).abs()
+            previous = col.slice(-10, 5) if n >= 10 else col.head(5)
+            exprs += [
+                col.mean().alias(f"mean_{name}"),
+                std.alias(f"std_{name}"),
+                col.min().alias(f"min_{name}"),
+                col.max().alias(f"max_{name}"),
+                col.null_count().alias(f"missing_{name}"),
+                (z > self.thresholds["anomaly_zscore"]).sum().alias(f"outliers_{name}"),
+                z.max().alias(f"max_z_{name}"),
+                col.tail(5).mean().alias(f"recent_{name}"),
+                previous.mean().alias(f"previous_{name}"),
+            ]
+        row = lf.select(exprs).collect(engine="streaming").row(0, named=True)
+        
+        return {
+            key: np.array([row[f"{key}_{name}"] for name in names], dtype=np.float64)
+            for key in REDUCTION_KEYS
+        }
+    
+    def _anomaly_mask(self, values: np.ndarray, mean: float, std: float) -> np.ndarray:
+        """Masque booléen des lignes dont le Z-score dépasse le seuil."""
+        return np.abs((values - mean) / std) > self.thresholds["anomaly_zscore"]
+    
     def analyze(self, df: pd.DataFrame) -> AnalysisResult:
         urgency_reasons = []
-        anomalies = []
         recommendations = []
         urgency_level = "normal"
         
         # Statistiques de base
+        missing_total = int(self._missing_counts(df).sum())
         stats = {
             "rows": df.shape[0],
             "columns": df.shape[1],
-            "missing_total": df.isnull().sum().sum(),
-            "missing_percent": (df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100
+            "missing_total": missing_total,
+            "missing_percent": (missing_total / df.size) * 100 if df.size else 0.0
         }
         
         # 1. Vérification données manquantes
@@ -53,53 +229,85 @@ class DataAnalyzer:
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         stats["numeric_columns"] = list(numeric_cols)
         
-        for col in numeric_cols:
-            col_data = {
-                "name": col,
-                "mean": df[col].mean(),
-                "std": df[col].std(),
-                "min": df[col].min(),
-                "max": df[col].max(),
-                "missing": df[col].isnull().sum()
+        # Réductions par colonne : noyau Numba pour les grands volumes, sinon Polars pour
+        # les tables hautes et étroites, bloc NumPy dans les autres cas
+        # (le bloc float64 lu ici sert aussi aux masques d'anomalies)
+        arr = None
+        if njit is not None and len(df) * len(numeric_cols) > NUMBA_MIN_CELLS:
+            arr = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            red = self._numba_reductions(arr)
+        elif pl is not None and len(df) >= POLARS_MIN_ROWS and 0 < len(numeric_cols) <= POLARS_MAX_COLUMNS:
+            red = self._polars_reductions(df, numeric_cols)
+        else:
+            arr = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            red = self._numpy_reductions(arr)
+        means, stds, outlier_counts, max_z = red["mean"], red["std"], red["outliers"], red["max_z"]
+        
+        # Tendances (si index temporel ou numérique) : 5 dernières valeurs vs 5 précédentes
+        if len(df) > 5:
+            recent_vec, prev_vec = red["recent"], red["previous"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change_pct = np.where(prev_vec != 0, (recent_vec - prev_vec) / np.abs(prev_vec) * 100, 0)
+        else:
+            change_pct = np.zeros(len(numeric_cols))
+        
+        numeric_means = {col: float(means[i]) for i, col in enumerate(numeric_cols)}
+        numeric_stds = {col: float(stds[i]) for i, col in enumerate(numeric_cols)}
+        stats["column_stats"] = {
+            col: {
+                "mean": numeric_means[col],
+                "std": numeric_stds[col],
+                "min": float(red["min"][i]),
+                "max": float(red["max"][i]),
+                "missing": int(red["missing"][i]),
+                "trend_change": float(change_pct[i])
             }
-            
-            # Détection anomalies (Z-score)
-            if col_data["std"] > 0:
-                z_scores = np.abs((df[col] - col_data["mean"]) / col_data["std"])
-                outliers = df[z_scores > self.thresholds["anomaly_zscore"]]
-                
-                if len(outliers) > 0:
-                    anomalies.append({
-                        "column": col,
-                        "count": len(outliers),
-                        "percentage": (len(outliers) / len(df)) * 100,
-                        "max_zscore": z_scores.max()
-                    })
-                    urgency_reasons.append(f"📊 {len(outliers)} anomalies dans '{col}' (Z-score max: {z_scores.max():.2f})")
-                    if urgency_level == "normal":
-                        urgency_level = "warning"
-                    recommendations.append(f"Revoir les valeurs extrêmes dans '{col}'")
-            
-            # Détection tendances (si index temporel ou numérique)
-            if len(df) > 5:
-                recent = df[col].iloc[-5:].mean()
-                previous = df[col].iloc[-10:-5].mean() if len(df) >= 10 else df[col].iloc[:5].mean()
-                
-                if previous != 0:
-                    change_pct = ((recent - previous) / abs(previous)) * 100
-                    col_data["trend_change"] = change_pct
-                    
-                    if abs(change_pct) > self.thresholds["critical_drop"]:
-                        direction = "📉 CHUTE" if change_pct < 0 else "📈 PIC"
-                        urgency_reasons.append(f"🚨 {direction} de {abs(change_pct):.1f}% dans '{col}' (CRITIQUE)")
-                        urgency_level = "critical"
-                        recommendations.append(f"URGENCE: Investigation immédiate sur '{col}'")
-                    elif abs(change_pct) > self.thresholds["warning_drop"]:
-                        direction = "📉 Baisse" if change_pct < 0 else "📈 Hausse"
-                        urgency_reasons.append(f"⚠️ {direction} de {abs(change_pct):.1f}% dans '{col}'")
-                        if urgency_level == "normal":
-                            urgency_level = "warning"
-                        recommendations.append(f"Surveiller attentivement '{col}'")
+            for i, col in enumerate(numeric_cols)
+        }
+        
+        # Catégorisation par masques : seules les colonnes signalées génèrent des messages
+        anom_mask = outlier_counts > 0
+        crit_mask = np.abs(change_pct) > self.thresholds["critical_drop"]
+        warn_mask = ~crit_mask & (np.abs(change_pct) > self.thresholds["warning_drop"])
+        anom_idx, crit_idx, warn_idx = np.flatnonzero(anom_mask), np.flatnonzero(crit_mask), np.flatnonzero(warn_mask)
+        cols = list(numeric_cols)
+        
+        # Détection anomalies (Z-score)
+        anomalies = [
+            {
+                "column": cols[i],
+                "count": int(outlier_counts[i]),
+                "percentage": float(outlier_counts[i] / len(df)) * 100,
+                "max_zscore": float(max_z[i])
+            }
+            for i in anom_idx
+        ]
+        anomaly_masks = {
+            cols[i]: self._anomaly_mask(
+                arr[:, i] if arr is not None else df[cols[i]].to_numpy(dtype=np.float64, na_value=np.nan),
+                means[i], stds[i]
+            )
+            for i in anom_idx
+        }
+        urgency_reasons += [f"📊 {int(outlier_counts[i])} anomalies dans '{cols[i]}' (Z-score max: {max_z[i]:.2f})" for i in anom_idx]
+        recommendations += [f"Revoir les valeurs extrêmes dans '{cols[i]}'" for i in anom_idx]
+        
+        # Détection tendances
+        urgency_reasons += [
+            f"🚨 {'📉 CHUTE' if change_pct[i] < 0 else '📈 PIC'} de {abs(change_pct[i]):.1f}% dans '{cols[i]}' (CRITIQUE)"
+            for i in crit_idx
+        ]
+        recommendations += [f"URGENCE: Investigation immédiate sur '{cols[i]}'" for i in crit_idx]
+        urgency_reasons += [
+            f"⚠️ {'📉 Baisse' if change_pct[i] < 0 else '📈 Hausse'} de {abs(change_pct[i]):.1f}% dans '{cols[i]}'"
+            for i in warn_idx
+        ]
+        recommendations += [f"Surveiller attentivement '{cols[i]}'" for i in warn_idx]
+        
+        if crit_mask.any():
+            urgency_level = "critical"
+        elif urgency_level == "normal" and (anom_mask.any() or warn_mask.any()):
+            urgency_level = "warning"
         
         # 3. Génération résumé
         if urgency_level == "critical":
@@ -119,5 +327,8 @@ class DataAnalyzer:
             summary=summary,
             anomalies_detected=anomalies,
             recommendations=recommendations,
-            stats=stats
+            stats=stats,
+            numeric_means=numeric_means,
+            numeric_stds=numeric_stds,
+            anomaly_masks=anomaly_masks
         )
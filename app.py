@@ -1,9 +1,14 @@
+import hashlib
+import io
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pac
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from analyzer import DataAnalyzer, AnalysisResult
+from loader import read_upload
 
 # Configuration
 st.set_page_config(
@@ -82,27 +87,51 @@ with col2:
     st.markdown("### ℹ️ Info")
     st.info("L'agent analysera automatiquement vos données et affichera les alertes visuelles ici.")
 
+# Cache des calculs : relancés seulement si le fichier ou les seuils changent.
+# Clé = empreinte du fichier (calculée une fois par rerun) ; les paramètres préfixés par "_"
+# ne sont pas hachés par Streamlit, le contenu brut n'est donc jamais re-haché.
+@st.cache_data(max_entries=4)
+def _load(file_key: str, name: str, _file_bytes: bytes) -> pd.DataFrame:
+    return read_upload(_file_bytes, name)
+
+@st.cache_data(max_entries=4)
+def _analyze(file_key: str, name: str, thresholds: tuple, _file_bytes: bytes) -> AnalysisResult:
+    analyzer = DataAnalyzer()
+    analyzer.thresholds.update(dict(thresholds))
+    return analyzer.analyze(_load(file_key, name, _file_bytes))
+
+@st.cache_data(max_entries=4)
+def _column_info(file_key: str, name: str, _file_bytes: bytes) -> pd.DataFrame:
+    df = _load(file_key, name, _file_bytes)
+    return pd.DataFrame({
+        'Colonne': df.columns,
+        'Type': df.dtypes.values,
+        'Non-Nuls': df.count().values,
+        'Nuls': df.isnull().sum().values,
+        'Unique': df.nunique().values
+    })
+
+@st.cache_data(max_entries=4)
+def _describe(file_key: str, name: str, _file_bytes: bytes) -> pd.DataFrame:
+    return _load(file_key, name, _file_bytes).select_dtypes(include=[np.number]).describe()
+
 # Traitement des données
 if uploaded_file:
     # Lecture
     try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file)
+        file_bytes = uploaded_file.getvalue()
+        file_key = hashlib.sha1(file_bytes).hexdigest()
+        df = _load(file_key, uploaded_file.name, file_bytes)
         
-        # Initialisation analyseur avec seuils personnalisés
-        analyzer = DataAnalyzer()
-        analyzer.thresholds.update({
+        # Analyse avec seuils personnalisés
+        thresholds = {
             "critical_drop": critical_drop,
             "warning_drop": warning_drop,
             "anomaly_zscore": anomaly_zscore,
             "missing_critical": missing_critical,
             "missing_warning": missing_warning
-        })
-        
-        # Analyse
-        result = analyzer.analyze(df)
+        }
+        result = _analyze(file_key, uploaded_file.name, tuple(sorted(thresholds.items())), file_bytes)
         
         # ==================== RÉSULTATS ====================
         
@@ -179,14 +208,7 @@ if uploaded_file:
             
             # Info sur les colonnes
             st.markdown("### ℹ️ Information des Colonnes")
-            col_info = pd.DataFrame({
-                'Colonne': df.columns,
-                'Type': df.dtypes.values,
-                'Non-Nuls': df.count().values,
-                'Nuls': df.isnull().sum().values,
-                'Unique': df.nunique().values
-            })
-            st.dataframe(col_info, use_container_width=True)
+            st.dataframe(_column_info(file_key, uploaded_file.name, file_bytes), use_container_width=True)
         
         with tab2:
             # Statistiques descriptives
@@ -194,7 +216,7 @@ if uploaded_file:
             
             if not numeric_df.empty:
                 st.markdown("### 📊 Statistiques Descriptives")
-                st.dataframe(numeric_df.describe(), use_container_width=True)
+                st.dataframe(_describe(file_key, uploaded_file.name, file_bytes), use_container_width=True)
                 
                 # Graphiques de distribution
                 st.markdown("### 📈 Distributions")
@@ -214,28 +236,28 @@ if uploaded_file:
                 
                 # Graphique de tendance temporelle (si index numérique)
                 st.markdown("### 📉 Tendance")
+                # Rendu WebGL (pas de nœud SVG par point). Toute la série est envoyée : sous Streamlit,
+                # aucun callback ne permet de recharger le détail au zoom, donc pas de décimation.
+                values = df[selected_col].to_numpy(dtype=np.float64, na_value=np.nan)
                 fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    y=df[selected_col].values,
+                fig.add_trace(go.Scattergl(
+                    y=values,
                     mode='lines',
                     name=selected_col,
                     line=dict(color='blue', width=2)
                 ))
                 
                 # Marquer les anomalies
-                if result.anomalies_detected:
-                    for anom in result.anomalies_detected:
-                        if anom["column"] == selected_col:
-                            # Trouver indices des anomalies
-                            z_scores = abs((df[selected_col] - df[selected_col].mean()) / df[selected_col].std())
-                            anomaly_indices = df[z_scores > 3].index
-                            fig.add_trace(go.Scatter(
-                                x=anomaly_indices,
-                                y=df.loc[anomaly_indices, selected_col],
-                                mode='markers',
-                                name='Anomalies',
-                                marker=dict(color='red', size=10, symbol='x')
-                            ))
+                if selected_col in result.anomaly_masks:
+                    # Positions des anomalies (masque calculé par l'analyseur)
+                    idx = np.flatnonzero(result.anomaly_masks[selected_col])
+                    fig.add_trace(go.Scattergl(
+                        x=idx,
+                        y=values[idx],
+                        mode='markers',
+                        name='Anomalies',
+                        marker=dict(color='red', size=10, symbol='x')
+                    ))
                 
                 fig.update_layout(title=f"Tendance de {selected_col} avec Anomalies")
                 st.plotly_chart(fig, use_container_width=True)
@@ -254,8 +276,7 @@ if uploaded_file:
                         st.write(f"**Z-score maximum:** {anom['max_zscore']:.2f}")
                         
                         # Afficher les valeurs anormales
-                        z_scores = abs((df[anom['column']] - df[anom['column']].mean()) / df[anom['column']].std())
-                        abnormal_values = df[z_scores > 3][anom['column']].tolist()
+                        abnormal_values = df[anom['column']][result.anomaly_masks[anom['column']]].tolist()
                         st.write(f"**Valeurs anormales:** {abnormal_values[:10]}...")  # Limiter l'affichage
             else:
                 st.success("✅ Aucune anomalie statistique détectée")
@@ -299,13 +320,22 @@ STATISTIQUES:
         
         with col_exp2:
             # Export données avec flag d'anomalie
-            df_export = df.copy()
-            for anom in result.anomalies_detected:
-                col = anom['column']
-                z_scores = abs((df[col] - df[col].mean()) / df[col].std())
-                df_export[f"{col}_anomaly"] = z_scores > 3
+            # Colonnes d'anomalie assemblées en un bloc puis une seule concaténation
+            flags = pd.DataFrame(
+                {f"{col}_anomaly": mask for col, mask in result.anomaly_masks.items()},
+                index=df.index
+            )
+            # Les colonnes *_anomaly déjà présentes dans le fichier sont remplacées, pas dupliquées
+            df_export = pd.concat([df.drop(columns=flags.columns, errors="ignore"), flags], axis=1)
             
-            csv = df_export.to_csv(index=False)
+            # Encodage CSV multi-threadé via Arrow (chaînes entre guillemets, booléens true/false).
+            # Colonnes objet à types mélangés (fréquent en Excel) : repli sur l'encodeur pandas.
+            try:
+                buf = io.BytesIO()
+                pac.write_csv(pa.Table.from_pandas(df_export, preserve_index=False), buf)
+                csv = buf.getvalue()
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                csv = df_export.to_csv(index=False)
             st.download_button(
                 label="📊 Télécharger Données avec Flags (CSV)",
                 data=csv,
@@ -0,0 +1,37 @@
+import io
+import pandas as pd
+
+try:
+    import polars as pl
+    import polars.selectors as cs
+except ImportError:  # Polars optionnel : repli sur le moteur CSV pyarrow de pandas
+    pl = None
+
+# Marqueurs de valeurs manquantes reconnus par défaut par pd.read_csv
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+def read_csv(file_bytes: bytes) -> pd.DataFrame:
+    """Lit un CSV en DataFrame pandas sur buffers Arrow, avec la même sémantique NA que pd.read_csv."""
+    if pl is not None:
+        # Parseur Polars multi-threadé, remis à pandas sur buffers Arrow (sans copie NumPy).
+        # Types inférés sur tout le fichier : un "1.5" après 100 entiers ne doit pas échouer.
+        try:
+            df = pl.read_csv(file_bytes, try_parse_dates=True, infer_schema_length=None, null_values=NA_VALUES)
+            # NaN flottant -> null, comme une cellule vide pour pandas
+            return df.with_columns(cs.float().fill_nan(None)).to_pandas(use_pyarrow_extension_array=True)
+        except pl.exceptions.ComputeError:
+            pass  # Repli sur le moteur pyarrow de pandas
+    return pd.read_csv(io.BytesIO(file_bytes), engine="pyarrow", dtype_backend="pyarrow")
+
+def read_upload(file_bytes: bytes, name: str) -> pd.DataFrame:
+    """Lit un fichier chargé (CSV ou Excel) d'après son extension."""
+    if name.endswith('.csv'):
+        return read_csv(file_bytes)
+    try:
+        # Lecteur Rust calamine (python-calamine), nettement plus rapide qu'openpyxl
+        return pd.read_excel(io.BytesIO(file_bytes), engine="calamine")
+    except ImportError:  # python-calamine optionnel : moteur par défaut de pandas
+        return pd.read_excel(io.BytesIO(file_bytes))
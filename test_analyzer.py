@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+from analyzer import DataAnalyzer
+
+
+def _epoch_column(n, seed=0):
+    """Timestamps ~1.7e9 à faible variance, avec quelques valeurs extrêmes."""
+    rng = np.random.default_rng(seed)
+    values = 1.7e9 + rng.normal(0, 50, n)
+    spikes = rng.choice(n, max(n // 300, 1), replace=False)
+    values[spikes] += rng.choice([-1, 1], spikes.size) * rng.uniform(300, 450, spikes.size)
+    return values
+
+
+def _reference_outliers(series, threshold=3):
+    """Comptage Z-score de référence, calculé avec pandas en float64."""
+    z = np.abs((series - series.mean()) / series.std())
+    return int((z > threshold).sum())
+
+
+def _assert_reductions_match(fused, reference):
+    # Welford (Numba) et deux passes (NumPy) diffèrent au dernier ordre ; les comptages doivent être exacts
+    for key in analyzer.REDUCTION_KEYS:
+        if key in ("missing", "outliers"):
+            np.testing.assert_array_equal(fused[key], reference[key], err_msg=key)
+        else:
+            np.testing.assert_allclose(fused[key], reference[key], rtol=1e-6, equal_nan=True, err_msg=key)
+
+
+@pytest.mark.skipif(analyzer.njit is None, reason="numba non installé")
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_numba_matches_numpy(dtype):
+    rng = np.random.default_rng(1)
+    arr = rng.normal(10, 3, size=(5000, 5))
+    arr[::5, 0] = np.nan
+    arr[:, 1] = 7.0                    # écart-type nul
+    arr[:, 2] = np.nan                 # colonne vide
+    arr[3, 3] = 200                    # valeur extrême
+    arr = np.asfortranarray(arr.astype(dtype))
+
+    data_analyzer = DataAnalyzer()
+    fused = data_analyzer._numba_reductions(arr)
+    reference = data_analyzer._numpy_reductions(arr)
+    _assert_reductions_match(fused, reference)
+
+
+@pytest.mark.skipif(analyzer.njit is None, reason="numba non installé")
+def test_numba_matches_numpy_on_large_magnitude_column():
+    arr = np.column_stack([_epoch_column(20000), np.arange(100000001, 100020001, dtype=np.float64)])
+    data_analyzer = DataAnalyzer()
+    fused = data_analyzer._numba_reductions(arr)
+    reference = data_analyzer._numpy_reductions(arr)
+    _assert_reductions_match(fused, reference)
+
+
+@pytest.mark.skipif(analyzer.pl is None, reason="polars non installé")
+def test_polars_matches_numpy():
+    rng = np.random.default_rng(4)
+    arr = rng.normal(10, 3, size=(3000, 4))
+    arr[::7, 0] = np.nan
+    arr[:, 1] = 7.0                    # écart-type nul
+    arr[:, 2] = np.nan                 # colonne vide
+    arr[3, 3] = 200                    # valeur extrême
+    df = pd.DataFrame(arr, columns=list("abcd"))
+
+    data_analyzer = DataAnalyzer()
+    _assert_reductions_match(
+        data_analyzer._polars_reductions(df, df.columns),
+        data_analyzer._numpy_reductions(df.to_numpy()),
+    )
+
+
+def test_large_integers_keep_exact_min_max():
+    df = pd.DataFrame({"big": np.arange(100000001, 100000101, dtype=np.float64)})
+    stats = DataAnalyzer().analyze(df).stats["column_stats"]["big"]
+    assert stats["min"] == 100000001
+    assert stats["max"] == 100000100
+
+
+@pytest.mark.parametrize("rows", [2000, 1_200_000])
+def test_large_magnitude_outliers_match_reference(rows):
+    # 1.2M lignes : passe par le noyau Numba quand il est disponible
+    df = pd.DataFrame({"epoch": _epoch_column(rows)})
+    result = DataAnalyzer().analyze(df)
+
+    expected = _reference_outliers(df["epoch"])
+    assert expected > 0
+    assert result.anomalies_detected[0]["count"] == expected
+    assert int(result.anomaly_masks["epoch"].sum()) == expected
+
+
+def test_missing_total_counts_nan_in_arrow_columns():
+    pa = pytest.importorskip("pyarrow")
+    values = [1.0, np.nan, 3.0, None, 5.0, np.nan]
+    numpy_df = pd.DataFrame({"a": values, "b": ["x", None, "y", "z", None, "w"]})
+    arrow_df = pd.DataFrame({
+        # from_pandas=False : les NaN restent des NaN et non des nulls Arrow
+        "a": pd.arrays.ArrowExtensionArray(pa.chunked_array([pa.array(values, from_pandas=False)])),
+        "b": numpy_df["b"].astype(pd.ArrowDtype(pa.string())),
+    })
+
+    expected = DataAnalyzer().analyze(numpy_df)
+    result = DataAnalyzer().analyze(arrow_df)
+    assert expected.stats["missing_total"] == 5
+    assert result.stats["missing_total"] == expected.stats["missing_total"]
+    assert result.stats["column_stats"]["a"]["missing"] == 3
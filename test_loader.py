@@ -0,0 +1,54 @@
+import io
+
+import pandas as pd
+import pytest
+
+import loader
+
+CSV_WITH_NA_TOKENS = (
+    b"a,b,c,d\n"
+    b"1,10,1.5,x\n"
+    b"2,NA,NaN,NA\n"
+    b"3,11,2.5,y\n"
+    b"4,N/A,nan,\n"
+    b"5,null,3.5,null\n"
+    b"6,12,NULL,z\n"
+    b"7,#N/A,-nan,None\n"
+)
+
+
+@pytest.mark.skipif(loader.pl is None, reason="polars non installé")
+def test_polars_loader_matches_pandas_na_handling():
+    expected = pd.read_csv(io.BytesIO(CSV_WITH_NA_TOKENS))
+    df = loader.read_csv(CSV_WITH_NA_TOKENS)
+
+    assert list(df.columns) == list(expected.columns)
+    for col in expected.columns:
+        assert pd.api.types.is_numeric_dtype(df[col]) == pd.api.types.is_numeric_dtype(expected[col]), col
+    assert df.isna().sum().tolist() == expected.isna().sum().tolist()
+
+
+def test_pyarrow_fallback_matches_pandas_na_handling(monkeypatch):
+    monkeypatch.setattr(loader, "pl", None)
+    expected = pd.read_csv(io.BytesIO(CSV_WITH_NA_TOKENS))
+    df = loader.read_csv(CSV_WITH_NA_TOKENS)
+
+    for col in expected.columns:
+        assert pd.api.types.is_numeric_dtype(df[col]) == pd.api.types.is_numeric_dtype(expected[col]), col
+    assert df.isna().sum().tolist() == expected.isna().sum().tolist()
+
+
+def test_excel_falls_back_without_calamine(monkeypatch):
+    pytest.importorskip("openpyxl")
+    buf = io.BytesIO()
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).to_excel(buf, index=False)
+    read_excel = pd.read_excel
+
+    def read_excel_without_calamine(*args, engine=None, **kwargs):
+        if engine == "calamine":
+            raise ImportError("Missing optional dependency 'python-calamine'.")
+        return read_excel(*args, engine=engine, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", read_excel_without_calamine)
+    df = loader.read_upload(buf.getvalue(), "donnees.xlsx")
+    assert df["a"].tolist() == [1, 2, 3]